@@ -1,127 +1,161 @@
 """
 Pipeline Engine Implementation - Production Grade
 """
+import sys
 import time
-import random
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Mapping, Optional, Set, Tuple
 from collections import defaultdict
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
+from types import MappingProxyType
+import functools
 import hashlib
 import json
 
 
-class TaskStatus(Enum):
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
+PLAN_CACHE_SIZE = 64
 
 
-@dataclass
-class TaskResult:
-    task_name: str
-    status: TaskStatus
-    start_time: Optional[float] = None
-    end_time: Optional[float] = None
-    error: Optional[str] = None
-    duration: float = 0.0
+class TaskStatus(IntEnum):
+    PENDING = 0
+    RUNNING = 1
+    COMPLETED = 2
+    FAILED = 3
 
 
-@dataclass
+@dataclass(frozen=True)
 class Task:
     name: str
-    dependencies: List[str]
+    dependencies: Tuple[str, ...]
     execution_time: float
     failure_rate: float = 0.0
-    status: TaskStatus = TaskStatus.PENDING
+
+
+@dataclass
+class DLQEntry:
+    """A single dead letter queue record"""
+    # Declared by hand rather than with dataclass(slots=True), which needs 3.10
+    __slots__ = ('task', 'reason', 'timestamp', 'context')
+    task: str
+    reason: str
+    timestamp: int
+    context: Optional[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the entry for the result report"""
+        record = {"task": self.task, "reason": self.reason, "timestamp": self.timestamp}
+        if self.context:
+            record["context"] = self.context
+        return record
 
 
 @dataclass
 class ExecutionContext:
-    """Immutable context for a pipeline execution"""
+    """Mutable state of a single pipeline execution"""
     seed: int
-    task_results: Dict[str, TaskResult] = field(default_factory=dict)
+    # Per-task outcomes, kept as parallel dicts keyed on task name
+    statuses: Dict[str, TaskStatus] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
     execution_order: List[str] = field(default_factory=list)
-    dlq: List[Dict[str, Any]] = field(default_factory=list)
+    dlq: List[DLQEntry] = field(default_factory=list)
     
     def is_task_completed(self, task_name: str) -> bool:
         """Check if a task is completed successfully"""
-        result = self.task_results.get(task_name)
-        return result is not None and result.status == TaskStatus.COMPLETED
+        return self.statuses.get(task_name) is TaskStatus.COMPLETED
     
     def is_task_failed(self, task_name: str) -> bool:
         """Check if a task has failed"""
-        result = self.task_results.get(task_name)
-        return result is not None and result.status == TaskStatus.FAILED
+        return self.statuses.get(task_name) is TaskStatus.FAILED
     
     def can_execute_task(self, task: Task) -> bool:
         """Check if all dependencies are met for a task"""
-        for dep in task.dependencies:
-            # Dependency must exist and be completed successfully
-            if dep not in self.task_results or not self.is_task_completed(dep):
-                return False
-        return True
-    
-    def clone(self) -> 'ExecutionContext':
-        """Create a copy of the context"""
-        return ExecutionContext(
-            seed=self.seed,
-            task_results=self.task_results.copy(),
-            execution_order=self.execution_order.copy(),
-            dlq=self.dlq.copy()
-        )
-
-
-class DeterministicRandom:
-    """Deterministic random number generator"""
-    
-    def __init__(self, seed: int):
-        self.seed = seed
-        self.states: Dict[str, random.Random] = {}
-    
-    def get_rng(self, context: str) -> random.Random:
-        """Get a deterministic random generator for a specific context"""
-        if context not in self.states:
-            # Create a new RNG with a seed derived from the main seed and context
-            context_seed = (self.seed + hash(context)) % (2**32)
-            self.states[context] = random.Random(context_seed)
-        return self.states[context]
+        # Dependency must exist and be completed successfully
+        return all(self.is_task_completed(dep) for dep in task.dependencies)
 
 
 class DLQSystem:
     """Dead Letter Queue System"""
     
-    def __init__(self, seed: int):
-        self.failures: List[Dict[str, Any]] = []
-        self.seed = seed
+    def __init__(self):
+        self.failures: List[DLQEntry] = []
         self.counter = 0
     
     def add_failure(self, task_name: str, reason: str, context: Optional[Dict[str, Any]] = None):
         """Add a failure to the DLQ"""
-        # Use deterministic "timestamp" based on seed and counter
-        deterministic_timestamp = self.seed + self.counter * 0.001
+        # Use a logical clock as the deterministic "timestamp": the failure's
+        # position in the queue, free of floating point arithmetic
+        self.failures.append(DLQEntry(task_name, reason, self.counter, context))
         self.counter += 1
-        
-        failure_record = {
-            "task": task_name,
-            "reason": reason,
-            "timestamp": deterministic_timestamp,
-        }
-        if context:
-            failure_record["context"] = context
-        self.failures.append(failure_record)
     
-    def get_failures(self) -> List[Dict[str, Any]]:
+    def get_failures(self) -> List[DLQEntry]:
         """Get all failures"""
-        return self.failures.copy()
+        return self.failures
+
+
+@dataclass(frozen=True)
+class SchedulePlan:
+    """Static schedule for one dependency graph shape"""
+    task_order: Tuple[str, ...]
+    missing: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    # Read-only view: the plan is shared by every run of the same graph
+    dependents: Mapping[str, Tuple[str, ...]]
+    waves: Tuple[Tuple[str, ...], ...]
+
+
+@functools.lru_cache(maxsize=PLAN_CACHE_SIZE)
+def plan_schedule(graph: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> SchedulePlan:
+    """Plan the Kahn waves of a graph given as sorted (name, dependencies) pairs.
+
+    A task that runs always runs in the wave after its last dependency, so the
+    waves computed as if every task succeeded stay valid when some fail; the
+    engine only has to skip tasks cascaded to the DLQ. Tasks with missing
+    dependencies are reported in ``missing`` and never scheduled.
+    """
+    task_order = tuple(name for name, _ in graph)
+    dependents = {name: [] for name in task_order}
+    indegree = {}
+    missing = []
+    for name, deps in graph:
+        missing_deps = tuple(dep for dep in deps if dep not in dependents)
+        if missing_deps:
+            missing.append((name, missing_deps))
+
+        # Duplicate dependencies count once
+        unique_deps = dict.fromkeys(deps)
+        indegree[name] = len(unique_deps)
+        for dep in unique_deps:
+            if dep in dependents:
+                dependents[dep].append(name)
+
+    invalid_tasks = {name for name, _ in missing}
+    waves = []
+    ready = [name for name in task_order if indegree[name] == 0 and name not in invalid_tasks]
+    while ready:
+        waves.append(tuple(ready))
+        next_ready = []
+        for name in ready:
+            for child in dependents[name]:
+                indegree[child] -= 1
+                if indegree[child] == 0 and child not in invalid_tasks:
+                    next_ready.append(child)
+        ready = sorted(next_ready)
+
+    return SchedulePlan(
+        task_order=task_order,
+        missing=tuple(missing),
+        dependents=MappingProxyType(
+            {name: tuple(children) for name, children in dependents.items()}
+        ),
+        waves=tuple(waves),
+    )
 
 
 class PipelineEngine:
     def __init__(self):
         self.tasks: Dict[str, Task] = {}
         self.dlq_system: Optional[DLQSystem] = None
-        self.random_generator: Optional[DeterministicRandom] = None
+        self._dependents: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
 
     def add_task(self, task: Task):
         """Add a task to the pipeline"""
@@ -131,10 +165,8 @@ class PipelineEngine:
         """Run the pipeline with the given configuration"""
         start_time = 0.0  # Use deterministic start time
         
-        # Initialize deterministic random generator
-        seed = config.get('seed', 42)
-        self.random_generator = DeterministicRandom(seed)
-        self.dlq_system = DLQSystem(seed)  # Deterministic DLQ
+        seed = self._normalize_seed(config.get('seed', 42))
+        self.dlq_system = DLQSystem()  # Deterministic DLQ
         
         # Parse tasks from config
         self._parse_config(config)
@@ -150,88 +182,85 @@ class PipelineEngine:
         # Return results
         return self._generate_result(final_context, end_time - start_time)
 
+    @staticmethod
+    def _normalize_seed(seed: Any) -> int:
+        """Return the seed as an int, accepting integral floats such as 42.0.
+
+        The seed keys each task's hash as 8 unsigned bytes, so it must lie in
+        [0, 2**64); wrapping larger or negative seeds would alias them.
+        """
+        if isinstance(seed, float) and seed.is_integer():
+            seed = int(seed)
+        if isinstance(seed, bool) or not isinstance(seed, int):
+            raise ValueError(f"Pipeline seed must be an integer, got {seed!r}")
+        if not 0 <= seed < 1 << 64:
+            raise ValueError(f"Pipeline seed must be in [0, 2**64), got {seed!r}")
+        return seed
+
     def _parse_config(self, config: Dict[str, Any]):
         """Parse tasks from configuration"""
         for task_config in config.get('tasks', []):
+            # Intern names so the scheduler's dict lookups hit identity checks
             task = Task(
-                name=task_config['name'],
-                dependencies=task_config.get('dependencies', []),
+                name=sys.intern(task_config['name']),
+                dependencies=tuple(sys.intern(dep) for dep in task_config.get('dependencies', [])),
                 execution_time=task_config.get('execution_time', 1.0),
                 failure_rate=task_config.get('failure_rate', 0.0)
             )
             self.add_task(task)
 
     def _execute_tasks(self, context: ExecutionContext, renderer) -> ExecutionContext:
-        """Execute tasks respecting dependencies in a deterministic way"""
-        # Work with a copy of the context to ensure immutability
-        current_context = context.clone()
-        
-        # Get tasks that haven't been processed yet
-        remaining_tasks = set(self.tasks.keys())
-        processed_tasks = set()
-        
-        # Continue until all tasks are processed or we reach a deadlock
-        while remaining_tasks:
-            # Find tasks that can be executed now (dependencies satisfied)
-            executable_tasks = []
-            
-            for task_name in sorted(remaining_tasks):  # Sort for deterministic order
-                task = self.tasks[task_name]
-                
-                # Check if all dependencies are met
-                can_execute = True
-                missing_deps = []
-                failed_deps = []
-                
-                for dep in task.dependencies:
-                    if dep not in self.tasks:
-                        # Missing dependency
-                        missing_deps.append(dep)
-                        can_execute = False
-                    elif not current_context.is_task_completed(dep):
-                        if current_context.is_task_failed(dep):
-                            failed_deps.append(dep)
-                        can_execute = False
-                
-                # Handle dependency issues
-                if missing_deps:
-                    self.dlq_system.add_failure(
-                        task_name, 
-                        f"Missing dependencies: {', '.join(missing_deps)}"
-                    )
-                    processed_tasks.add(task_name)
-                    remaining_tasks.remove(task_name)
-                    continue
-                    
-                if failed_deps:
-                    self.dlq_system.add_failure(
-                        task_name, 
-                        f"Failed dependencies: {', '.join(failed_deps)}"
-                    )
-                    processed_tasks.add(task_name)
-                    remaining_tasks.remove(task_name)
-                    continue
-                
-                if can_execute:
-                    executable_tasks.append(task_name)
-            
-            # If no tasks can be executed, we have a deadlock
-            if not executable_tasks:
-                # Move all remaining tasks to DLQ
-                for task_name in sorted(remaining_tasks):  # Sort for deterministic order
-                    self.dlq_system.add_failure(
-                        task_name, 
-                        "Circular dependency or unresolvable dependencies"
-                    )
-                    processed_tasks.add(task_name)
+        """Execute tasks respecting dependencies in a deterministic way, updating context in place"""
+        # Scheduling depends only on the graph shape, so the plan is shared
+        # by every run of the same graph
+        plan = plan_schedule(tuple(
+            (name, tuple(task.dependencies)) for name, task in sorted(self.tasks.items())
+        ))
+        self._dependents = plan.dependents
+
+        # Missing dependencies never resolve
+        for task_name, missing_deps in plan.missing:
+            self.dlq_system.add_failure(
+                task_name,
+                f"Missing dependencies: {', '.join(missing_deps)}"
+            )
+        remaining_tasks = self.tasks.keys() - {name for name, _ in plan.missing}
+
+        # Bind everything the per-task hot path touches to locals once per run
+        tasks = self.tasks
+        COMPLETED = TaskStatus.COMPLETED
+        FAILED = TaskStatus.FAILED
+        blake2b = hashlib.blake2b
+        seed_key = context.seed.to_bytes(8, 'little')
+
+        def execute_task(task_name: str) -> Tuple[TaskStatus, float, Optional[str]]:
+            """Execute a single task and return its (status, duration, error)"""
+            task = tasks[task_name]
+            duration = task.execution_time  # Deterministic duration
+            try:
+                # Derive a uniform draw in [0, 1) from a keyed hash of the seed and
+                # task name: reproducible across processes, no RNG state to seed
+                digest = blake2b(task_name.encode(), key=seed_key, digest_size=8).digest()
+                draw = int.from_bytes(digest, 'little') / (1 << 64)
+
+                # Determine if task succeeds based on failure rate
+                if draw > task.failure_rate:
+                    return COMPLETED, duration, None
+                return FAILED, duration, "Task failed due to configured failure rate"
+
+            except Exception as e:
+                return FAILED, duration, str(e)
+
+        for wave in plan.waves:
+            # Skip tasks already sent to the DLQ by a failure cascade
+            ready = [name for name in wave if name in remaining_tasks]
+            if not ready:
                 break
-            
+
             # Execute tasks in deterministic order
-            for task_name in sorted(executable_tasks):  # Sort for deterministic order
-                task = self.tasks[task_name]
-                processed_tasks.add(task_name)
+            for task_name in ready:
                 remaining_tasks.remove(task_name)
-                
+
                 # Notify renderer (isolated from execution)
                 if renderer:
                     try:
@@ -239,72 +268,80 @@ class PipelineEngine:
                     except Exception:
                         # Renderer failure doesn't affect pipeline
                         pass
-                
-                # Execute task and get result
-                task_result = self._execute_task(task, current_context)
-                
+
+                status, duration, error = execute_task(task_name)
+
                 # Update context with task result
-                current_context.task_results[task_name] = task_result
-                current_context.execution_order.append(task_name)
-                
+                context.statuses[task_name] = status
+                context.durations[task_name] = duration
+                if error is not None:
+                    context.errors[task_name] = error
+                context.execution_order.append(task_name)
+
+                if status is FAILED:
+                    self._cascade_failure(task_name, remaining_tasks)
+
                 # Notify renderer (isolated from execution)
                 if renderer:
                     try:
-                        if task_result.status == TaskStatus.COMPLETED:
+                        if status is COMPLETED:
                             renderer.task_completed(task_name)
                         else:
                             renderer.task_failed(task_name)
                     except Exception:
                         # Renderer failure doesn't affect pipeline
                         pass
-        
+
+            # Emit the wave's renderer output in one write (isolated from execution)
+            if renderer:
+                try:
+                    renderer.flush()
+                except Exception:
+                    # Renderer failure doesn't affect pipeline
+                    pass
+
+        # Whatever is left is part of a cycle or waits on an unrunnable task
+        for task_name in plan.task_order:
+            if task_name not in remaining_tasks:
+                continue
+            self.dlq_system.add_failure(
+                task_name,
+                "Circular dependency or unresolvable dependencies"
+            )
+
         # Add DLQ failures to context
-        current_context.dlq = self.dlq_system.get_failures()
-        return current_context
+        context.dlq = self.dlq_system.failures
+        return context
 
-    def _execute_task(self, task: Task, context: ExecutionContext) -> TaskResult:
-        """Execute a single task and return its result"""
-        result = TaskResult(task_name=task.name, status=TaskStatus.RUNNING)
-        result.start_time = 0.0  # Deterministic start time
-        
-        try:
-            # Get deterministic random generator for this task
-            rng = self.random_generator.get_rng(f"{context.seed}:{task.name}")
-            
-            # Determine if task succeeds based on failure rate (this is deterministic now)
-            success = rng.random() > task.failure_rate
-            
-            result.end_time = result.start_time + task.execution_time  # Deterministic end time
-            result.duration = task.execution_time  # Deterministic duration
-            result.status = TaskStatus.COMPLETED if success else TaskStatus.FAILED
-            
-            if not success:
-                result.error = "Task failed due to configured failure rate"
-                
-        except Exception as e:
-            result.end_time = result.start_time + task.execution_time
-            result.duration = task.execution_time
-            result.status = TaskStatus.FAILED
-            result.error = str(e)
-        
-        return result
+    def _cascade_failure(self, task_name: str, remaining_tasks: Set[str]):
+        """Send every task downstream of a failed task to the DLQ"""
+        stack = [task_name]
+        while stack:
+            parent = stack.pop()
+            # Always name the task that actually failed; deeper descendants
+            # also name the blocked dependency they were reached through
+            if parent == task_name:
+                reason = f"Failed dependencies: {task_name}"
+            else:
+                reason = f"Failed dependencies: {task_name} (via {parent})"
+            for child in self._dependents[parent]:
+                # Tasks already executed or in the DLQ are no longer remaining
+                if child in remaining_tasks:
+                    remaining_tasks.remove(child)
+                    self.dlq_system.add_failure(child, reason)
+                    stack.append(child)
 
     def _generate_result(self, context: ExecutionContext, total_duration: float) -> Dict[str, Any]:
         """Generate the final result"""
-        completed_tasks = [
-            name for name, result in context.task_results.items() 
-            if result.status == TaskStatus.COMPLETED
-        ]
-        failed_tasks = [
-            name for name, result in context.task_results.items() 
-            if result.status == TaskStatus.FAILED
-        ]
-        
-        # Calculate per-task durations
-        task_durations = {}
-        for name, result in context.task_results.items():
-            task_durations[name] = result.duration
-        
+        # Categorize tasks in a single pass
+        completed_tasks = []
+        failed_tasks = []
+        for name, status in context.statuses.items():
+            if status is TaskStatus.COMPLETED:
+                completed_tasks.append(name)
+            elif status is TaskStatus.FAILED:
+                failed_tasks.append(name)
+
         return {
             "summary": {
                 "total_tasks": len(self.tasks),
@@ -315,7 +352,7 @@ class PipelineEngine:
             },
             "completed_tasks": completed_tasks,
             "failed_tasks": failed_tasks,
-            "dlq": context.dlq,
+            "dlq": [entry.to_dict() for entry in context.dlq],
             "execution_order": context.execution_order,
-            "task_durations": task_durations
+            "task_durations": context.durations
         }
\ No newline at end of file
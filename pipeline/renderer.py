@@ -2,13 +2,14 @@
 Renderer for pipeline visualization
 """
 import sys
-from typing import Any
+from typing import Any, List
 
 
 class ConsoleRenderer:
     def __init__(self):
         self.enabled = True
         self.fail_on_task = None  # For testing renderer isolation
+        self._buf: List[str] = []  # Lines waiting for the next flush
 
     def task_started(self, task_name: str):
         """Called when a task starts"""
@@ -16,12 +17,7 @@ class ConsoleRenderer:
             raise Exception("Intentional renderer failure")
             
         if self.enabled:
-            try:
-                print(f"[STARTED] {task_name}")
-                sys.stdout.flush()
-            except Exception:
-                # If rendering fails, disable renderer but don't crash pipeline
-                self.enabled = False
+            self._buf.append(f"[STARTED] {task_name}")
 
     def task_completed(self, task_name: str):
         """Called when a task completes successfully"""
@@ -29,21 +25,24 @@ class ConsoleRenderer:
             raise Exception("Intentional renderer failure")
             
         if self.enabled:
-            try:
-                print(f"[COMPLETED] {task_name}")
-                sys.stdout.flush()
-            except Exception:
-                # If rendering fails, disable renderer but don't crash pipeline
-                self.enabled = False
+            self._buf.append(f"[COMPLETED] {task_name}")
 
     def task_failed(self, task_name: str):
         """Called when a task fails"""
         if self.fail_on_task == task_name:
             raise Exception("Intentional renderer failure")
             
+        if self.enabled:
+            self._buf.append(f"[FAILED] {task_name}")
+
+    def flush(self):
+        """Write buffered lines in one go, called once per execution wave"""
+        if not self._buf:
+            return
+        lines, self._buf = self._buf, []
         if self.enabled:
             try:
-                print(f"[FAILED] {task_name}")
+                sys.stdout.write("\n".join(lines) + "\n")
                 sys.stdout.flush()
             except Exception:
                 # If rendering fails, disable renderer but don't crash pipeline
@@ -7,15 +7,21 @@ from pipeline.engine import PipelineEngine
 from pipeline.renderer import ConsoleRenderer
 import json
 
+try:
+    import orjson  # Optional, much faster JSON decoding and encoding
+except ImportError:
+    orjson = None
+
 
 def main():
     # Load pipeline configuration
     try:
-        with open('pipeline_config.json', 'r') as f:
-            config = json.load(f)
+        with open('pipeline_config.json', 'rb') as f:
+            config_bytes = f.read()
     except FileNotFoundError:
         print("Error: pipeline_config.json not found")
         return 1
+    config = orjson.loads(config_bytes) if orjson is not None else json.loads(config_bytes)
     
     # Create engine and renderer
     engine = PipelineEngine()
@@ -25,8 +31,13 @@ def main():
     result = engine.run(config, renderer)
     
     # Save result
-    with open('result.json', 'w') as f:
-        json.dump(result, f, indent=2)
+    if orjson is not None:
+        data = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    else:
+        # Same layout as orjson: two-space indent, raw UTF-8
+        data = json.dumps(result, indent=2, ensure_ascii=False).encode()
+    with open('result.json', 'wb') as f:
+        f.write(data)
     
     print("Pipeline completed. Results saved to result.json")
     return 0
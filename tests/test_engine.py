@@ -0,0 +1,236 @@
+"""
+Tests for the pipeline engine
+"""
+import copy
+import json
+import os
+import random
+import unittest
+
+from pipeline.engine import PipelineEngine, Task, plan_schedule
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'pipeline_config.json')
+
+
+def load_config():
+    with open(CONFIG_PATH) as f:
+        return json.load(f)
+
+
+def make_config(tasks, seed=42, failure_rate=0.0):
+    """Build a config from (name, dependencies) pairs"""
+    return {
+        "seed": seed,
+        "tasks": [
+            {"name": name, "dependencies": deps, "execution_time": 0.1, "failure_rate": failure_rate}
+            for name, deps in tasks
+        ],
+    }
+
+
+def reference_execution_order(config, outcomes):
+    """Execution order of the original rescanning scheduler.
+
+    ``outcomes`` maps each executed task to whether it completed; a task the
+    reference wants to run but the engine never ran is a scheduling bug.
+    """
+    deps = {task["name"]: task["dependencies"] for task in config["tasks"]}
+    remaining = {name for name, task_deps in deps.items() if all(d in deps for d in task_deps)}
+    completed = set()
+    order = []
+    while True:
+        ready = sorted(n for n in remaining if all(d in completed for d in deps[n]))
+        if not ready:
+            return order
+        for name in ready:
+            if name not in outcomes:
+                raise AssertionError(f"engine never ran {name}, which was runnable")
+            remaining.remove(name)
+            order.append(name)
+            if outcomes[name]:
+                completed.add(name)
+
+
+def random_graph(rng, size):
+    """Random graph with cycles, self-loops, missing and duplicate dependencies"""
+    names = [f"t{i}" for i in range(size)]
+    tasks = []
+    for i, name in enumerate(names):
+        deps = []
+        for _ in range(rng.randint(0, 3)):
+            roll = rng.random()
+            if roll < 0.05:
+                deps.append("ghost")
+            elif roll < 0.15:
+                deps.append(rng.choice(names))  # May point forward or at itself
+            elif i:
+                deps.append(names[rng.randrange(i)])
+        tasks.append((name, deps))
+    rng.shuffle(tasks)
+    return tasks
+
+
+class SilentRenderer:
+    """Renderer that ignores events"""
+
+    def task_started(self, task_name):
+        pass
+
+    def task_completed(self, task_name):
+        pass
+
+    def task_failed(self, task_name):
+        pass
+
+    def flush(self):
+        pass
+
+
+class EngineStateTest(unittest.TestCase):
+    def test_run_leaves_tasks_and_dlq_on_the_engine(self):
+        config = load_config()
+        config['tasks'][0]['failure_rate'] = 1.0  # Populate the DLQ
+
+        engine = PipelineEngine()
+        engine.run(config)
+
+        self.assertEqual(sorted(engine.tasks), ['task_a', 'task_b', 'task_c', 'task_d'])
+        self.assertEqual(len(engine.dlq_system.get_failures()), 3)
+
+
+class SeedTest(unittest.TestCase):
+    def test_integral_float_seed_matches_int_seed(self):
+        config = load_config()
+        float_config = copy.deepcopy(config)
+        config['seed'] = 42
+        float_config['seed'] = 42.0
+
+        result = PipelineEngine().run(config, SilentRenderer())
+        float_result = PipelineEngine().run(float_config, SilentRenderer())
+
+        self.assertEqual(result, float_result)
+
+    def test_non_integral_seed_is_rejected(self):
+        config = load_config()
+        config['seed'] = 42.5
+
+        with self.assertRaises(ValueError):
+            PipelineEngine().run(config)
+
+    def test_out_of_range_seeds_are_rejected(self):
+        for seed in (-1, 2**64, 5 + 2**64):
+            config = load_config()
+            config['seed'] = seed
+            with self.subTest(seed=seed), self.assertRaises(ValueError):
+                PipelineEngine().run(config)
+
+    def test_largest_seed_is_accepted(self):
+        config = load_config()
+        config['seed'] = 2**64 - 1
+
+        result = PipelineEngine().run(config, SilentRenderer())
+
+        self.assertEqual(result['summary']['total_tasks'], 4)
+
+
+class FailureCascadeTest(unittest.TestCase):
+    def test_descendants_name_the_failed_task(self):
+        config = load_config()
+        config['tasks'][0]['failure_rate'] = 1.0  # task_a always fails
+
+        result = PipelineEngine().run(config, SilentRenderer())
+
+        self.assertEqual(result['failed_tasks'], ['task_a'])
+        reasons = {entry['task']: entry['reason'] for entry in result['dlq']}
+        self.assertEqual(reasons['task_b'], "Failed dependencies: task_a")
+        self.assertEqual(reasons['task_c'], "Failed dependencies: task_a")
+        self.assertTrue(reasons['task_d'].startswith("Failed dependencies: task_a (via "))
+
+
+class TaskTest(unittest.TestCase):
+    def test_parsed_tasks_are_immutable_and_hashable(self):
+        engine = PipelineEngine()
+        engine.run(load_config(), SilentRenderer())
+
+        task = engine.tasks['task_d']
+        self.assertEqual(task.dependencies, ('task_b', 'task_c'))
+        self.assertEqual(hash(task), hash(Task('task_d', ('task_b', 'task_c'), 0.1, 0.0)))
+
+
+class SchedulerTest(unittest.TestCase):
+    def assert_matches_reference(self, config):
+        result = PipelineEngine().run(config)
+        outcomes = dict.fromkeys(result['completed_tasks'], True)
+        outcomes.update(dict.fromkeys(result['failed_tasks'], False))
+
+        self.assertEqual(result['execution_order'], reference_execution_order(config, outcomes))
+        dlq_tasks = [entry['task'] for entry in result['dlq']]
+        self.assertCountEqual(
+            dlq_tasks + result['execution_order'],
+            [task['name'] for task in config['tasks']]
+        )
+        return result
+
+    def test_cycles_and_self_loops_go_to_dlq(self):
+        config = make_config([
+            ("a", []), ("b", ["c"]), ("c", ["b"]), ("d", ["b"]), ("s", ["s"]),
+        ])
+
+        result = self.assert_matches_reference(config)
+
+        self.assertEqual(result['execution_order'], ['a'])
+        reasons = {entry['task']: entry['reason'] for entry in result['dlq']}
+        for name in ('b', 'c', 'd', 's'):
+            self.assertEqual(reasons[name], "Circular dependency or unresolvable dependencies")
+
+    def test_missing_dependency_blocks_dependents(self):
+        config = make_config([("x", ["ghost"]), ("y", ["x"]), ("z", [])])
+
+        result = self.assert_matches_reference(config)
+
+        self.assertEqual(result['execution_order'], ['z'])
+        reasons = {entry['task']: entry['reason'] for entry in result['dlq']}
+        self.assertEqual(reasons['x'], "Missing dependencies: ghost")
+        self.assertEqual(reasons['y'], "Circular dependency or unresolvable dependencies")
+
+    def test_duplicate_dependencies_count_once(self):
+        config = make_config([("a", []), ("b", ["a", "a"]), ("c", ["b", "a", "b"])])
+
+        result = self.assert_matches_reference(config)
+
+        self.assertEqual(result['execution_order'], ['a', 'b', 'c'])
+
+    def test_cached_plan_stays_valid_across_failure_patterns(self):
+        tasks = random_graph(random.Random(7), 14)
+        plan_schedule.cache_clear()
+
+        failure_patterns = set()
+        for seed in range(40):
+            result = self.assert_matches_reference(make_config(tasks, seed=seed, failure_rate=0.4))
+            failure_patterns.add(tuple(result['failed_tasks']))
+
+        self.assertGreater(len(failure_patterns), 5)
+        self.assertEqual(plan_schedule.cache_info().misses, 1)
+
+    def test_random_graphs_match_reference(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            tasks = random_graph(rng, rng.randint(0, 12))
+            config = make_config(tasks, seed=rng.randrange(1000), failure_rate=rng.choice([0.0, 0.3, 0.7]))
+            with self.subTest(config=config):
+                self.assert_matches_reference(config)
+
+    def test_plan_dependents_are_read_only(self):
+        engine = PipelineEngine()
+        engine.run(load_config())
+
+        with self.assertRaises(TypeError):
+            engine._dependents['task_a'] = ()
+        plan = plan_schedule((('a', ()), ('b', ('a',))))
+        with self.assertRaises(TypeError):
+            plan.dependents['a'] = ()
+
+
+if __name__ == '__main__':
+    unittest.main()